@@ -1,159 +1,99 @@
-import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-from io import BytesIO
-
-st.set_page_config(page_title="Bloom Calendar", layout="wide")
-
-# -------------------------
-# Load Data
-# -------------------------
-@st.cache_data
-def load_data():
-    try:
-        df = pd.read_csv("plants.csv")
-    except FileNotFoundError:
-        st.error("❌ Could not find `plants.csv`. Make sure it's in the same folder as `app.py`.")
-        return None
-
-    # Normalize column names (lowercase + underscores)
-    df.columns = [c.strip().lower().replace(" ", "_") for c in df.columns]
-
-    required = ["scientific_name", "common_name", "sun", "soil_type",
-                "drought_tolerant", "mature_size_(m)", "flower_color", "blooming_season"]
-    missing = [col for col in required if col not in df.columns]
-
-    if missing:
-        st.error(f"❌ Missing columns in plants.csv: {missing}")
-        return None
-
-    # Clean blooming_season: strip, split, capitalize, filter empty
-    df["blooming_season"] = df["blooming_season"].astype(str).str.strip()
-    df["blooming_season"] = df["blooming_season"].apply(
-        lambda x: ",".join([s.strip().capitalize() for s in x.split(",") if s.strip()])
-    )
-
-    # Ensure flower_color is string and lowercase for consistency
-    df["flower_color"] = df["flower_color"].astype(str).str.strip().str.lower()
-
-    return df
-
-plants = load_data()
-if plants is None:
-    st.stop()
-
-# -------------------------
-# Sidebar Filters
-# -------------------------
-st.sidebar.header("🌿 Filter Plants")
-
-sun_options = sorted(plants["sun"].dropna().unique().tolist())
-soil_options = sorted(plants["soil_type"].dropna().unique().tolist())
-color_options = sorted(plants["flower_color"].dropna().unique().tolist())
-drought_options = sorted(plants["drought_tolerant"].dropna().unique().tolist())
-
-selected_sun = st.sidebar.multiselect("☀️ Sun", sun_options, default=sun_options)
-selected_soil = st.sidebar.multiselect("🌱 Soil Type", soil_options, default=soil_options)
-selected_color = st.sidebar.multiselect("🎨 Flower Color", color_options, default=color_options)
-selected_drought = st.sidebar.multiselect("💧 Drought Tolerant", drought_options, default=drought_options)
-
-# -------------------------
-# Apply Filters
-# -------------------------
-filtered = plants[
-    plants["sun"].isin(selected_sun) &
-    plants["soil_type"].isin(selected_soil) &
-    plants["flower_color"].isin(selected_color) &
-    plants["drought_tolerant"].isin(selected_drought)
-].reset_index(drop=True)
-
-st.write(f"### Showing {len(filtered)} plant(s)")
-
-if len(filtered) == 0:
-    st.info("🔍 No plants match your filters. Try adjusting the criteria.")
-    st.stop()
-
-# -------------------------
-# Bloom Calendar Plot
-# -------------------------
-seasons = ["Spring", "Summer", "Autumn", "Winter"]
-y_labels = filtered["scientific_name"].tolist()
-
-# Map user-friendly color names to valid Matplotlib colors
-color_map = {
-    "red": "red", "pink": "pink", "purple": "purple", "blue": "blue",
-    "yellow": "yellow", "orange": "orange", "white": "white", "gray": "gray",
-    "green": "green", "brown": "brown", "lavender": "orchid", "lightpink": "lightpink",
-    "crimson": "crimson", "magenta": "magenta", "teal": "teal", "cyan": "cyan",
-    "lime": "lime", "gold": "gold", "coral": "coral", "salmon": "salmon",
-    "violet": "violet", "navy": "navy", "olive": "olive"
-}
-
-fig, ax = plt.subplots(figsize=(12, max(6, len(filtered) * 0.3)))
-ax.set_facecolor("#f8f9fa")
-
-# Track unique original colors for legend
-unique_colors = filtered["flower_color"].dropna().unique()
-color_legend = {color: [] for color in unique_colors}
-
-for _, row in filtered.iterrows():
-    bloom_seasons = [s.strip().capitalize() for s in row["blooming_season"].split(",") if s.strip()]
-    flower_color = row["flower_color"]  # Already normalized to lowercase
-    mapped_color = color_map.get(flower_color, "gray")  # Fallback to gray if unknown
-
-    for season in bloom_seasons:
-        if season in seasons:
-            x = seasons.index(season)
-            y = filtered.index.get_loc(_)  # Safe index lookup
-            ax.scatter(x, y, color=mapped_color, s=200, edgecolor="black", alpha=0.9)
-            color_legend[flower_color].append(row["common_name"])
-
-# Set ticks and labels
-ax.set_xticks(range(len(seasons)))
-ax.set_xticklabels(seasons, fontsize=12)
-ax.set_yticks(range(len(y_labels)))
-ax.set_yticklabels(y_labels, fontsize=10)
-ax.set_title("🌸 Seasonal Bloom Calendar", fontsize=16, fontweight="bold", pad=20)
-
-# Legend (limit to top 10 to avoid clutter)
-if len(color_legend) > 10:
-    st.warning("⚠️ More than 10 flower colors detected. Legend limited to first 10 for clarity.")
-    color_legend = dict(list(color_legend.items())[:10])
-
-legend_elements = [
-    plt.Line2D(
-        [0], [0], marker='o', color='w',
-        label=f"{color.capitalize()} ({len(names)} plants)",
-        markerfacecolor=color_map.get(color, "gray"),
-        markersize=10, markeredgecolor='black'
-    )
-    for color, names in color_legend.items()
-]
-if legend_elements:
-    ax.legend(handles=legend_elements, loc="upper right", bbox_to_anchor=(1.4, 1), fontsize=9)
-
-plt.tight_layout()
-plt.subplots_adjust(right=0.75)
-st.pyplot(fig)
-
-# -------------------------
-# Download Button
-# -------------------------
-buf = BytesIO()
-fig.savefig(buf, format="png", dpi=150, bbox_inches="tight")
-st.download_button(
-    label="⬇️ Download Bloom Calendar as PNG",
-    data=buf.getvalue(),
-    file_name="bloom_calendar.png",
-    mime="image/png"
-)
-
-# -------------------------
-# Optional: Show Full Plant List
-# -------------------------
-with st.expander("📋 View Full Plant List"):
-    st.dataframe(
-        filtered[["scientific_name", "common_name", "sun", "soil_type", "flower_color", "blooming_season", "drought_tolerant"]],
-        use_container_width=True,
-        height=300
-    )
\ No newline at end of file
+import streamlit as st
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from io import BytesIO
+
+import bloom_utils
+
+st.set_page_config(page_title="Bloom Calendar", layout="wide")
+
+# The helpers themselves are pure (no st.* calls), so only their return
+# values land in the caches — error reporting happens at the call site
+@st.cache_data
+def load_data():
+    # No parameters, so there is nothing to hash per rerun. The bloom
+    # table is derived here for the same reason: passing the plants
+    # frame to a cached function would re-hash it on every widget tick,
+    # and the list-valued season_list column defeats streamlit's fast
+    # pandas hasher and forces a whole-frame pickle each time.
+    plants, options = bloom_utils.load_plants()
+    return plants, options, bloom_utils.build_bloom_table(plants)
+
+# Cached as a resource: widget ticks that end up with the same filter
+# selections reuse the same Figure instead of reallocating
+# Figure/Axes/canvas buffers. Keyed on the cheap selection tuples; the
+# leading underscores tell streamlit not to hash the frames themselves.
+@st.cache_resource(max_entries=8)
+def build_fig(selection_key, _filtered, _bloom_table):
+    return bloom_utils.build_fig(_filtered, _bloom_table)
+
+# -------------------------
+# Filters + Plot Fragment
+# -------------------------
+@st.fragment
+def filters_and_plot(plants, filter_options, bloom_table):
+    # Everything interactive lives in this fragment, so widget changes
+    # rerun only this block instead of re-entering the whole script
+    st.sidebar.header("🌿 Filter Plants")
+
+    selected_sun = st.sidebar.multiselect("☀️ Sun", filter_options["sun"], default=filter_options["sun"])
+    selected_soil = st.sidebar.multiselect("🌱 Soil Type", filter_options["soil_type"], default=filter_options["soil_type"])
+    selected_color = st.sidebar.multiselect("🎨 Flower Color", filter_options["flower_color"], default=filter_options["flower_color"])
+    selected_drought = st.sidebar.multiselect("💧 Drought Tolerant", filter_options["drought_tolerant"], default=filter_options["drought_tolerant"])
+
+    selections = (
+        ("sun", selected_sun),
+        ("soil_type", selected_soil),
+        ("flower_color", selected_color),
+        ("drought_tolerant", selected_drought),
+    )
+
+    # Combine the masks as plain ndarrays — one reduce instead of chained
+    # Series.__and__ with an intermediate boolean Series per &
+    masks = [plants[column].isin(selected).to_numpy() for column, selected in selections]
+    # Keep the original index: it is the plant id used to slice the cached
+    # bloom table
+    filtered = plants.iloc[np.logical_and.reduce(masks)]
+
+    st.write(f"### Showing {len(filtered)} plant(s)")
+
+    if len(filtered) == 0:
+        st.info("🔍 No plants match your filters. Try adjusting the criteria.")
+        return
+
+    # The warning lives outside build_fig so it still shows on cache hits
+    if filtered["flower_color"].nunique() > 10:
+        st.warning("⚠️ More than 10 flower colors detected. Legend limited to first 10 for clarity.")
+
+    selection_key = tuple(tuple(sorted(selected)) for _, selected in selections)
+    fig = build_fig(selection_key, filtered, bloom_table)
+    st.pyplot(fig)
+
+    # Render straight through the Agg canvas instead of fig.savefig, which
+    # re-initializes a renderer (and re-measures a tight bbox) on every rerun
+    buf = BytesIO()
+    FigureCanvasAgg(fig).print_png(buf)
+    st.download_button(
+        label="⬇️ Download Bloom Calendar as PNG",
+        data=buf.getvalue(),
+        file_name="bloom_calendar.png",
+        mime="image/png"
+    )
+
+    with st.expander("📋 View Full Plant List"):
+        st.dataframe(
+            filtered[["scientific_name", "common_name", "sun", "soil_type", "flower_color", "blooming_season", "drought_tolerant"]],
+            use_container_width=True,
+            height=300
+        )
+
+try:
+    plants, filter_options, bloom_table = load_data()
+except FileNotFoundError:
+    st.error("❌ Could not find `plants.csv`. Make sure it's in the same folder as `app.py`.")
+    st.stop()
+except ValueError as exc:
+    st.error(f"❌ {exc}")
+    st.stop()
+
+filters_and_plot(plants, filter_options, bloom_table)
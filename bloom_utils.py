@@ -0,0 +1,163 @@
+"""Pure data and plotting helpers for the bloom-calendar app.
+
+Nothing in here touches Streamlit: app.py wraps these functions in
+st.cache_data / st.cache_resource and owns all widgets and error UI.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+import matplotlib.colors as mcolors
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+
+REQUIRED_COLUMNS = ["scientific_name", "common_name", "sun", "soil_type",
+                    "drought_tolerant", "mature_size_(m)", "flower_color", "blooming_season"]
+
+# Compiled once at import; str.findall with a precompiled pattern skips the
+# per-call cache lookup and flag parsing of re.findall
+_SEASON_RE = re.compile(r"spring|summer|autumn|winter", re.IGNORECASE)
+
+SEASONS = ["Spring", "Summer", "Autumn", "Winter"]
+SEASON_IDX = pd.Series(range(len(SEASONS)), index=SEASONS)
+
+# Map user-friendly color names to valid Matplotlib colors
+COLOR_MAP = {
+    "red": "red", "pink": "pink", "purple": "purple", "blue": "blue",
+    "yellow": "yellow", "orange": "orange", "white": "white", "gray": "gray",
+    "green": "green", "brown": "brown", "lavender": "orchid", "lightpink": "lightpink",
+    "crimson": "crimson", "magenta": "magenta", "teal": "teal", "cyan": "cyan",
+    "lime": "lime", "gold": "gold", "coral": "coral", "salmon": "salmon",
+    "violet": "violet", "navy": "navy", "olive": "olive"
+}
+
+# Resolve the color names to RGBA once at import; passing scatter a float
+# array short-circuits matplotlib's per-point color-string parsing
+_RGBA_BY_LABEL = {label: mcolors.to_rgba(mapped) for label, mapped in COLOR_MAP.items()}
+_RGBA_FALLBACK = mcolors.to_rgba("gray")
+
+
+def load_plants(path="plants.csv"):
+    """Read and normalize the plants CSV; returns (df, filter options)."""
+    df = pd.read_csv(path)
+
+    # Normalize column names (lowercase + underscores)
+    df.columns = [c.strip().lower().replace(" ", "_") for c in df.columns]
+
+    missing = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f"Missing columns in {path}: {missing}")
+
+    # Extract seasons with the precompiled regex (tolerates stray
+    # separators/whitespace) and rebuild a canonical blooming_season string
+    df["season_list"] = (
+        df["blooming_season"].astype(str).str.findall(_SEASON_RE)
+        .map(lambda tokens: [t.capitalize() for t in tokens])
+    )
+    df["blooming_season"] = df["season_list"].str.join(",")
+
+    # Ensure flower_color is string and lowercase for consistency; category
+    # dtype makes the isin filter an int-code comparison instead of
+    # per-row string hashing
+    df["flower_color"] = df["flower_color"].astype(str).str.strip().str.lower().astype("category")
+
+    # Same treatment for the other filter columns: category codes make
+    # isin an int compare and shrink the cells to one byte each
+    for column in ("sun", "soil_type", "drought_tolerant"):
+        df[column] = df[column].astype("category")
+
+    # Sidebar option lists ride along in the cache so reruns don't
+    # re-derive them from the frame
+    options = {
+        column: df[column].cat.categories.tolist()
+        for column in ("sun", "soil_type", "flower_color", "drought_tolerant")
+    }
+
+    return df, options
+
+
+def build_bloom_table(plants):
+    """Explode the plants frame into one (plant, season, x) row per bloom."""
+    # Computed once per dataset; render time only slices this by the
+    # surviving plants
+    bloom = (
+        plants[["common_name", "flower_color", "season_list"]]
+        .rename(columns={"season_list": "season"})
+        .explode("season")
+    )
+    bloom["x"] = bloom["season"].map(SEASON_IDX)
+    return bloom.dropna(subset=["x"])
+
+
+def build_fig(filtered, bloom_table):
+    """Draw the bloom-calendar Figure for a filtered frame."""
+    # Built via Figure() rather than pyplot so figures evicted from
+    # app.py's resource cache are garbage-collected (pyplot would pin
+    # them in its global figure registry).
+    # dpi set here so the PNG export renders at the same resolution the
+    # old savefig(dpi=150) call produced
+    fig = Figure(figsize=(12, max(6, len(filtered) * 0.3)), dpi=150)
+    ax = fig.subplots()
+    ax.set_facecolor("#f8f9fa")
+
+    y_labels = filtered["scientific_name"].tolist()
+
+    # Track unique original colors for legend
+    unique_colors = filtered["flower_color"].dropna().unique()
+    color_legend = {color: [] for color in unique_colors}
+
+    # Slice the precomputed (plant, season) table by plant id, then map
+    # each id to its row position in the filtered frame for the y axis
+    bloom_long = bloom_table[bloom_table.index.isin(filtered.index)]
+    y_of_plant = pd.Series(np.arange(len(filtered)), index=filtered.index)
+    bloom_long = bloom_long.assign(y=y_of_plant[bloom_long.index].to_numpy())
+
+    # All points in a single scatter call — one PathCollection Artist total,
+    # with per-point RGBA values (gray fallback for unknown color names).
+    # Resolve one RGBA row per category and index the LUT with the int
+    # codes; mapping the categorical with a tuple-returning lambda would
+    # make pandas build a MultiIndex of the results and blow up
+    rgba_lut = np.array(
+        [_RGBA_BY_LABEL.get(c, _RGBA_FALLBACK) for c in bloom_long["flower_color"].cat.categories],
+        dtype=np.float32,
+    )
+    point_colors = rgba_lut[bloom_long["flower_color"].cat.codes.to_numpy()]
+    # Stroking every marker outline dominates Agg's cost on dense plots,
+    # so drop the edges once the list is long and the rows are packed
+    edge = "black" if len(filtered) < 200 else "none"
+    # rasterized=True: the data marks are rendered once as a pixmap (axes,
+    # ticks and text stay vector), keeping the downloaded PNG small and
+    # savefig fast for long plant lists
+    ax.scatter(bloom_long["x"], bloom_long["y"], c=point_colors,
+               s=200, edgecolor=edge, linewidths=0 if edge == "none" else None,
+               alpha=0.9, rasterized=True)
+
+    for flower_color, group in bloom_long.groupby("flower_color", observed=True):
+        color_legend[flower_color] = group["common_name"].tolist()
+
+    # Set ticks and labels
+    ax.set_xticks(range(len(SEASONS)))
+    ax.set_xticklabels(SEASONS, fontsize=12)
+    ax.set_yticks(range(len(y_labels)))
+    ax.set_yticklabels(y_labels, fontsize=10)
+    ax.set_title("🌸 Seasonal Bloom Calendar", fontsize=16, fontweight="bold", pad=20)
+
+    # Legend (limit to top 10 to avoid clutter)
+    if len(color_legend) > 10:
+        color_legend = dict(list(color_legend.items())[:10])
+
+    legend_elements = [
+        Line2D(
+            [0], [0], marker='o', color='w',
+            label=f"{color.capitalize()} ({len(names)} plants)",
+            markerfacecolor=COLOR_MAP.get(color, "gray"),
+            markersize=10, markeredgecolor='black'
+        )
+        for color, names in color_legend.items()
+    ]
+    if legend_elements:
+        ax.legend(handles=legend_elements, loc="upper right", bbox_to_anchor=(1.4, 1), fontsize=9)
+
+    fig.tight_layout()
+    fig.subplots_adjust(right=0.75)
+    return fig